@@ -0,0 +1,52 @@
+"""금 현물 김치프리미엄 알림 봇.
+
+국내 금 시세(원/g)와 국제 금 시세(USD/OZS)를 긁어와 김치프리미엄을 계산하고,
+보유 ETF 현재가와 함께 텔레그램으로 전송한다. GitHub Actions cron에서 장중에만 실행.
+공용 헬퍼는 alert_core에 있고, 이 파일은 메시지 조립만 담당한다.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+
+from alert_core import *  # noqa: F403
+from alert_core import HEADERS, KST, OZT_IN_G  # 명시가 필요한 상수들
+
+
+async def main(now: datetime) -> None:
+    import aiohttp
+
+    # 다섯 건의 요청은 서로 의존성이 없으므로 이벤트 루프에서 전부 겹쳐 돌린다.
+    timeout = aiohttp.ClientTimeout(total=15)
+    async with aiohttp.ClientSession(headers=HEADERS, timeout=timeout) as s:
+        usdkrw, dom_gold, intl_gold, etf_prices = await asyncio.gather(
+            get_usdkrw(s),
+            get_domestic_gold_krw_per_g(s),
+            get_international_gold_usd_per_oz(s),
+            get_naver_prices(s, ["411060", "091160"]),
+        )
+    ace_price = etf_prices["411060"]
+    kodex_price = etf_prices["091160"]
+
+    intl_krw_per_g = intl_gold * usdkrw / OZT_IN_G
+    kimp = (dom_gold / intl_krw_per_g - 1.0) * 100.0
+
+    lines = [
+        f"🥇 금 김프 알림 {now.strftime('%m/%d %H:%M')}",
+        f"국내 금: {fmt_won(dom_gold)}원/g",
+        f"국제 금: {intl_gold:,.2f} USD/oz (환산 {fmt_won(intl_krw_per_g)}원/g)",
+        f"환율: {usdkrw:,.2f}원",
+        f"김프: {fmt_pct(kimp)}",
+        "",
+        f"ACE KRX금현물(411060): {fmt_won(ace_price)}원",
+        f"KODEX 은선물(091160): {fmt_won(kodex_price)}원",
+    ]
+    send_telegram("\n".join(lines))
+
+
+if __name__ == "__main__":
+    NOW = datetime.now(KST)
+    if not is_korean_market_hours(NOW):
+        raise SystemExit(0)
+    asyncio.run(main(NOW))
@@ -0,0 +1,264 @@
+"""알림 스크립트들이 공유하는 수집/포맷/전송 헬퍼 모음.
+
+aiohttp/requests는 임포트 비용이 커서 함수 안에서 늦게 불러온다.
+장외 시간에는 is_korean_market_hours만 보고 바로 종료하므로 그 경로에서는
+서드파티 임포트가 아예 일어나지 않는다.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import re
+import threading
+from datetime import datetime, timedelta, timezone
+from time import time as unix_now
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import aiohttp
+    import requests
+
+KST = timezone(timedelta(hours=9))
+
+HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (iPhone; CPU iPhone OS 16_0 like Mac OS X) "
+        "AppleWebKit/605.1.15 (KHTML, like Gecko) Version/16.0 Mobile/15E148 Safari/604.1"
+    ),
+    # brotli까지 협상해야 제일 큰 ACE 페이지 전송량이 확 줄어든다. 해제는
+    # aiohttp/requests가 알아서 해 준다 (brotli 패키지 필요).
+    "Accept-Encoding": "gzip, br, deflate",
+}
+
+URL_USDKRW = "https://m.stock.naver.com/marketindex/exchange/FX_USDKRW"
+URL_DOM_GOLD = "https://m.stock.naver.com/marketindex/metals/M04020000"
+URL_INTL_GOLD = "https://m.stock.naver.com/marketindex/metals/GCcv1"
+URL_NAVER_STOCK = "https://m.stock.naver.com/domestic/stock/{code}/total"
+URL_NAVER_POLLING = "https://polling.finance.naver.com/api/realtime/domestic/stock/{codes}"
+URL_ACE_411060 = "https://www.aceetf.co.kr/fund/detail/KR7411060000"
+
+OZT_IN_G = 31.1034768  # 트로이온스 -> 그램
+
+# KRX 정규장: 09:00 ~ 15:30 (HHMM 정수 비교용)
+_OPEN_HHMM = 900
+_CLOSE_HHMM = 1530
+
+# 환경변수는 임포트 때 한 번만 읽는다. 없으면 첫 전송 시점에 실패하도록 미룬다.
+try:
+    _TG_URL = f"https://api.telegram.org/bot{os.environ['TELEGRAM_BOT_TOKEN']}/sendMessage"
+    _TG_CHAT = os.environ["TELEGRAM_CHAT_ID"]
+except KeyError:
+    _TG_URL = _TG_CHAT = None
+
+_SESSION = None
+
+
+def _session() -> requests.Session:
+    """텔레그램 API용 keep-alive 세션. 첫 사용 시점에 만든다."""
+    global _SESSION
+    if _SESSION is None:
+        import requests
+        from requests.adapters import HTTPAdapter, Retry
+
+        _SESSION = requests.Session()
+        _SESSION.headers.update(HEADERS)
+        _SESSION.mount(
+            "https://",
+            HTTPAdapter(
+                pool_connections=4, pool_maxsize=8, max_retries=Retry(total=2, backoff_factor=0.3)
+            ),
+        )
+    return _SESSION
+
+# 환율과 국제 금 시세는 분 단위로나 움직이므로, 1분 cron이 돌 때마다 다시
+# 긁지 않도록 짧은 TTL로 디스크에 캐시한다. ETF 현재가는 틱 단위라 캐시하지 않는다.
+_CACHE_PATH = "/tmp/alert_cache.json"
+_CACHE_TTL = 60.0
+
+
+def _cache_load() -> dict:
+    try:
+        with open(_CACHE_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _cache_get(key: str) -> float | None:
+    entry = _cache_load().get(key)
+    if entry and unix_now() < entry[0]:
+        return entry[1]
+    return None
+
+
+def _cache_put(key: str, value: float) -> None:
+    cache = _cache_load()
+    cache[key] = (unix_now() + _CACHE_TTL, value)
+    try:
+        with open(_CACHE_PATH, "w", encoding="utf-8") as f:
+            json.dump(cache, f)
+    except OSError:
+        pass  # 캐시는 어디까지나 덤이므로 못 써도 그냥 넘어간다.
+
+
+# 매 호출마다 re 모듈 캐시를 거치지 않도록 전부 임포트 시점에 컴파일해 둔다.
+# 환율 페이지에는 맨눈에 보이는 가격 말고도 "원"이 붙은 숫자가 많아서
+# 가격을 감싸는 태그의 class로 앵커를 잡는다.
+_GRAPH_PRICE_RE = re.compile(r'class="GraphMain_price__[^"]*"[^>]*>([0-9][0-9,]*(?:\.[0-9]+)?)')
+_NUM_WON_G_RE = re.compile(r"([0-9][0-9,]*(?:\.[0-9]+)?)\s*원/g")
+_NUM_USD_OZ_RE = re.compile(r"([0-9][0-9,]*(?:\.[0-9]+)?)\s*USD/OZS")
+_NAVER_PRICE_RE = re.compile(r"현재가\s*([0-9]{1,3}(?:,[0-9]{3})*)")
+_NEXT_DATA_RE = re.compile(r'<script id="__NEXT_DATA__"[^>]*>(.*?)</script>', re.DOTALL)
+_CLOSE_PRICE_RE = re.compile(r'"closePrice"\s*:\s*"([0-9,.]+)"')
+# 현재가/NAV를 각각 따로 찾으면 수백 KB HTML을 패턴 수만큼 다시 훑는다.
+# 얼터네이션 하나로 합쳐 한 번만 스캔한다.
+_ACE_BOTH_RE = re.compile(
+    r"현재가[^0-9]*([0-9,.]+)\s*원|기준가\(NAV\)[^0-9]*([0-9,.]+)\s*원"
+)
+
+
+async def afetch(
+    session: aiohttp.ClientSession, url: str, prefix_bytes: int | None = None
+) -> str:
+    """url의 본문을 문자열로 받는다.
+
+    prefix_bytes를 주면 그만큼만 읽고 끊는다. 가격 리터럴은 문서 앞쪽에
+    있으므로 나머지 바이트를 받아서 디코딩할 필요가 없다.
+    """
+    async with session.get(url) as r:
+        r.raise_for_status()
+        if prefix_bytes is None:
+            return await r.text()
+        raw = await r.content.read(prefix_bytes)
+        return raw.decode(r.charset or "utf-8", errors="replace")
+
+
+def num_from(pattern: re.Pattern[str], txt: str) -> float:
+    m = pattern.search(txt)
+    if not m:
+        raise ValueError(f"가격 패턴을 찾지 못함: {pattern.pattern!r}")
+    return float(m.group(1).replace(",", ""))
+
+
+async def get_usdkrw(session: aiohttp.ClientSession) -> float:
+    cached = _cache_get("usdkrw")
+    if cached is not None:
+        return cached
+    html = await afetch(session, URL_USDKRW, prefix_bytes=32768)
+    value = num_from(_GRAPH_PRICE_RE, html)
+    _cache_put("usdkrw", value)
+    return value
+
+
+async def get_domestic_gold_krw_per_g(session: aiohttp.ClientSession) -> float:
+    html = await afetch(session, URL_DOM_GOLD, prefix_bytes=32768)
+    # "원/g" 리터럴은 원본 HTML에서도 가격 바로 뒤에 나오므로 DOM을 만들 필요가 없다.
+    return num_from(_NUM_WON_G_RE, html)
+
+
+async def get_international_gold_usd_per_oz(session: aiohttp.ClientSession) -> float:
+    cached = _cache_get("intl_gold")
+    if cached is not None:
+        return cached
+    html = await afetch(session, URL_INTL_GOLD, prefix_bytes=32768)
+    value = num_from(_NUM_USD_OZ_RE, html)
+    _cache_put("intl_gold", value)
+    return value
+
+
+async def get_naver_current_price(session: aiohttp.ClientSession, code: str) -> float:
+    html = await afetch(session, URL_NAVER_STOCK.format(code=code))
+    # 네이버 모바일 페이지는 __NEXT_DATA__ JSON 안에 현재가를 "closePrice"로
+    # 심어 둔다. 렌더링 텍스트를 통째로 펼치는 것보다 포맷 변경에 덜 취약하고,
+    # 스캔 범위도 해당 스크립트 블록 하나로 줄어든다.
+    blob = _NEXT_DATA_RE.search(html)
+    if blob:
+        m = _CLOSE_PRICE_RE.search(blob.group(1))
+        if m:
+            return float(m.group(1).replace(",", ""))
+    return num_from(_NAVER_PRICE_RE, html)
+
+
+async def get_naver_prices(session: aiohttp.ClientSession, codes: list[str]) -> dict[str, float]:
+    """폴링 API로 여러 종목의 현재가를 HTTP 요청 한 번에 받는다."""
+    import aiohttp
+
+    url = URL_NAVER_POLLING.format(codes=",".join(codes))
+    try:
+        async with session.get(url) as r:
+            r.raise_for_status()
+            payload = await r.json(content_type=None)
+        return {d["itemCode"]: float(str(d["closePrice"]).replace(",", "")) for d in payload["datas"]}
+    except (aiohttp.ClientError, KeyError, TypeError, ValueError):
+        # 폴링 API가 막히면 종목별 HTML 경로로 돌아간다.
+        prices = await asyncio.gather(*(get_naver_current_price(session, c) for c in codes))
+        return dict(zip(codes, prices))
+
+
+async def get_ace_411060_price_and_nav(session: aiohttp.ClientSession) -> tuple[float, float]:
+    """ACE 운용사 페이지에서 (현재가, 기준가 NAV)를 읽는다."""
+    html = await afetch(session, URL_ACE_411060)
+    # 메타 description도 본문의 부분 문자열이므로 본문 스캔 한 번이면 충분하다.
+    price = None
+    nav = None
+    for m in _ACE_BOTH_RE.finditer(html):
+        if m.group(1) is not None:
+            if price is None:
+                price = float(m.group(1).replace(",", ""))
+        else:
+            nav = float(m.group(2).replace(",", ""))  # 마지막 매치가 기준가
+    if price is None or nav is None:
+        raise ValueError("현재가/NAV를 찾지 못함")
+    return price, nav
+
+
+def is_korean_market_hours(now: datetime | None = None) -> bool:
+    if now is None:
+        now = datetime.now(KST)
+    if now.weekday() >= 5:
+        return False
+    hhmm = now.hour * 100 + now.minute
+    return _OPEN_HHMM <= hhmm <= _CLOSE_HHMM
+
+
+def fmt_won(x: float) -> str:
+    # round()는 float를 거쳐 오므로 반올림을 정수 경로로 직접 처리한다.
+    return format(int(x + (0.5 if x >= 0 else -0.5)), ",d")
+
+
+def fmt_pct(x: float) -> str:
+    return f"{x:+.2f}%"
+
+
+def _post_telegram(url: str, data: dict) -> None:
+    # 실패하면 예외가 스레드 excepthook을 타고 stderr로 남는다.
+    r = _session().post(url, data=data, timeout=20)
+    r.raise_for_status()
+
+
+def send_telegram(text: str) -> None:
+    if _TG_URL is None:
+        raise KeyError("TELEGRAM_BOT_TOKEN / TELEGRAM_CHAT_ID 환경변수가 필요함")
+    # 전송 뒤에 할 일이 없으므로 응답을 기다리지 않는다. non-daemon 스레드라
+    # 인터프리터가 종료 시점에 join해 주므로 전송 자체는 보장된다.
+    threading.Thread(target=_post_telegram, args=(_TG_URL, {"chat_id": _TG_CHAT, "text": text})).start()
+
+__all__ = [
+    "KST",
+    "HEADERS",
+    "OZT_IN_G",
+    "afetch",
+    "num_from",
+    "get_usdkrw",
+    "get_domestic_gold_krw_per_g",
+    "get_international_gold_usd_per_oz",
+    "get_naver_current_price",
+    "get_naver_prices",
+    "get_ace_411060_price_and_nav",
+    "is_korean_market_hours",
+    "fmt_won",
+    "fmt_pct",
+    "send_telegram",
+]